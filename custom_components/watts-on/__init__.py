@@ -6,10 +6,12 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .pywatts_on import WattsOnApi
-from .coordinator import WattsOnUpdateCoordinator
+from .coordinator import WattsOnUpdateCoordinator, degree_days_store
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,43 +20,68 @@ PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Watts On from a config entry."""
-    # Load stored tokens if available
+    # Load stored tokens and devices if available (handed over by the config flow)
     tokens = entry.data.get("tokens")
+    devices = entry.data.get("devices")
+
+    # Sampled degree-days survive restarts and reloads
+    saved_degree_days = await degree_days_store(hass, entry).async_load()
 
     # Initialize API client
     api = WattsOnApi(
         username=entry.data["username"],
         password=entry.data["password"],
         tokens=tokens,
+        time_zone=dt_util.get_time_zone(hass.config.time_zone),
+        devices=devices,
+        degree_days=saved_degree_days,
     )
 
     # Create coordinator
     coordinator = WattsOnUpdateCoordinator(hass, entry, api)
     await coordinator.async_refresh()
 
-    # Ensure refreshed tokens are persisted
-    if api.tokens != tokens:
+    # Ensure refreshed tokens and discovered devices are persisted
+    if api.tokens != tokens or (api.tokens and api.devices != devices):
         hass.config_entries.async_update_entry(
             entry,
-            data={**entry.data, "tokens": api.tokens},
+            data={**entry.data, "tokens": api.tokens, "devices": api.devices},
         )
-        _LOGGER.debug("Stored updated tokens in config entry")
+        _LOGGER.debug("Stored updated tokens and devices in config entry")
 
     # Store coordinator for platforms
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "api": api,
+        "options": dict(entry.options),
     }
 
+    # Reload when options change (token updates also notify listeners, so compare)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    await async_setup_services(hass)
+
     # Forward setup to platforms (sensor, switch, etc.)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry if its options changed."""
+    if hass.data[DOMAIN][entry.entry_id]["options"] != dict(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        async_unload_services(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored degree-days when the entry is deleted."""
+    await degree_days_store(hass, entry).async_remove()
@@ -2,45 +2,184 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Mapping
 import voluptuous as vol
 import logging
 
 from homeassistant import config_entries
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 
-from .const import DOMAIN, DEFAULT_NAME
+from .const import DOMAIN, DEFAULT_NAME, CONF_OUTDOOR_TEMPERATURE_ENTITY
+from .coordinator import get_outdoor_temperature_entity
+from .pywatts_on import WattsOnApi, WattsOnAuthError
 
 _LOGGER = logging.getLogger(__name__)
 
+OUTDOOR_TEMPERATURE_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
+)
+
+
+class CannotConnect(Exception):
+    """Raised when the Watts On cloud could not be reached."""
+
+
+class NoDevices(Exception):
+    """Raised when the account has neither a water nor a heating device."""
+
+
+async def validate_input(hass: HomeAssistant, username: str, password: str) -> dict[str, Any]:
+    """
+    Log in and discover devices once, returning data to hand over to the entry.
+
+    The tokens and device map are stored in the entry so setup does not need
+    to repeat the B2C login or the device lookup.
+    """
+    api = WattsOnApi(username=username, password=password)
+
+    def _login_and_discover() -> None:
+        api.ensure_token()
+        api.fetch_devices()
+
+    try:
+        await hass.async_add_executor_job(_login_and_discover)
+    except WattsOnAuthError:
+        raise
+    except Exception as err:
+        raise CannotConnect from err
+
+    # fetch_devices swallows errors and leaves the ids unset when the lookup failed
+    if api.water_device_id is None and api.heating_device_id is None:
+        raise CannotConnect
+    if not api.discovered_utilities():
+        raise NoDevices
+
+    return {"tokens": api.tokens, "devices": api.devices}
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Watts On."""
 
     VERSION = 1
 
+    _reauth_entry: config_entries.ConfigEntry | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+    async def _async_validate(self, username: str, password: str, errors: dict[str, str]) -> dict | None:
+        """Validate credentials, filling errors and returning None on failure."""
+        try:
+            return await validate_input(self.hass, username, password)
+        except WattsOnAuthError:
+            errors["base"] = "invalid_auth"
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except NoDevices:
+            errors["base"] = "no_devices"
+        except Exception:
+            _LOGGER.exception("Unexpected error while validating Watts On credentials")
+            errors["base"] = "unknown"
+        return None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            _LOGGER.debug("User input received: %s", user_input)
+            await self.async_set_unique_id(user_input["username"].lower())
+            self._abort_if_unique_id_configured()
 
-            # Create and store the entry
-            return self.async_create_entry(
-                title=DEFAULT_NAME,
-                data=user_input,
+            validated = await self._async_validate(
+                user_input["username"], user_input["password"], errors
             )
+            if validated is not None:
+                # Create and store the entry together with the login result
+                return self.async_create_entry(
+                    title=DEFAULT_NAME,
+                    data={**user_input, **validated},
+                )
 
         # Schema shown when form is displayed
         data_schema = vol.Schema(
             {
                 vol.Required("username"): str,
                 vol.Required("password"): str,
+                vol.Optional(CONF_OUTDOOR_TEMPERATURE_ENTITY): OUTDOOR_TEMPERATURE_SELECTOR,
             }
         )
 
         return self.async_show_form(
             step_id="user",
             data_schema=data_schema,
-        )
\ No newline at end of file
+            errors=errors,
+        )
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Start reauthentication after the stored credentials were rejected."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for a new password and validate it."""
+        errors: dict[str, str] = {}
+        entry = self._reauth_entry
+        if user_input is not None and entry is not None:
+            validated = await self._async_validate(
+                entry.data["username"], user_input["password"], errors
+            )
+            if validated is not None:
+                self.hass.config_entries.async_update_entry(
+                    entry,
+                    data={**entry.data, "password": user_input["password"], **validated},
+                )
+                await self.hass.config_entries.async_reload(entry.entry_id)
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required("password"): str}),
+            errors=errors,
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Watts On options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the outdoor temperature entity used for degree-days."""
+        if user_input is not None:
+            # Store the key even when cleared so it overrides the value from setup
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_OUTDOOR_TEMPERATURE_ENTITY: user_input.get(CONF_OUTDOOR_TEMPERATURE_ENTITY)
+                },
+            )
+
+        current = get_outdoor_temperature_entity(self._entry)
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_OUTDOOR_TEMPERATURE_ENTITY,
+                    description={"suggested_value": current},
+                ): OUTDOOR_TEMPERATURE_SELECTOR,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
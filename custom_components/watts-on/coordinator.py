@@ -4,15 +4,42 @@ from __future__ import annotations
 from datetime import timedelta
 import logging
 
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.util.unit_conversion import TemperatureConverter
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_OUTDOOR_TEMPERATURE_ENTITY,
+    DEGREE_DAYS_SAVE_DELAY,
+    DEGREE_DAYS_STORAGE_VERSION,
+    UTILITY_TYPES,
+)
+from .pywatts_on import WattsOnAuthError
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def get_outdoor_temperature_entity(entry: ConfigEntry) -> str | None:
+    """Return the outdoor temperature entity, preferring options over the original setup data."""
+    if CONF_OUTDOOR_TEMPERATURE_ENTITY in entry.options:
+        return entry.options[CONF_OUTDOOR_TEMPERATURE_ENTITY]
+    return entry.data.get(CONF_OUTDOOR_TEMPERATURE_ENTITY)
+
+
+def _utilities(devices: dict) -> set[str]:
+    return {utility for utility in UTILITY_TYPES if devices.get(utility)}
+
+
+def degree_days_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the sampled degree-days for an entry."""
+    return Store(hass, DEGREE_DAYS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.degree_days")
+
+
 class WattsOnUpdateCoordinator(DataUpdateCoordinator):
     """Manages fetching data from the Watts On API."""
 
@@ -33,24 +60,65 @@ class WattsOnUpdateCoordinator(DataUpdateCoordinator):
         )
         self.api = api_client
         self.entry = entry
+        self.degree_days_store = degree_days_store(hass, entry)
+
+    def _outdoor_temperature(self) -> float | None:
+        """Return the configured outdoor temperature, if any, for degree-days."""
+        entity_id = get_outdoor_temperature_entity(self.entry)
+        if not entity_id:
+            return None
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            _LOGGER.debug("Outdoor temperature %s is not numeric: %s", entity_id, state.state)
+            return None
+        # Degree-days use a Celsius base, but the sensor reports in the user's unit system
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, UnitOfTemperature.CELSIUS)
+        try:
+            return TemperatureConverter.convert(value, unit, UnitOfTemperature.CELSIUS)
+        except HomeAssistantError:
+            _LOGGER.debug("Outdoor temperature %s has unsupported unit: %s", entity_id, unit)
+            return None
 
     async def _async_update_data(self):
         """Fetch data from the API and persist updated tokens if needed."""
         try:
             # Fetch whatever main payload your integration needs
-            data = await self.hass.async_add_executor_job(self.api.fetch_data)
+            outdoor_temperature = self._outdoor_temperature()
+            data = await self.hass.async_add_executor_job(
+                self.api.fetch_data, outdoor_temperature
+            )
+            if outdoor_temperature is not None:
+                self.degree_days_store.async_delay_save(
+                    self.api.degree_days.as_dict, DEGREE_DAYS_SAVE_DELAY
+                )
 
-            # Check if tokens changed (refreshed / re-logged in)
+            # Check if tokens or devices changed (refreshed / re-logged in / rediscovered)
             stored_tokens = self.entry.data.get("tokens")
-            if self.api.tokens and self.api.tokens != stored_tokens:
-                _LOGGER.debug("Updating config entry with refreshed tokens")
+            stored_devices = self.entry.data.get("devices")
+            if self.api.tokens and (
+                self.api.tokens != stored_tokens or self.api.devices != stored_devices
+            ):
+                _LOGGER.debug("Updating config entry with refreshed tokens and devices")
                 self.hass.config_entries.async_update_entry(
                     self.entry,
-                    data={**self.entry.data, "tokens": self.api.tokens},
+                    data={**self.entry.data, "tokens": self.api.tokens, "devices": self.api.devices},
                 )
 
+                # A meter added to the account later needs a reload to get its sensors
+                if stored_devices and _utilities(stored_devices) != _utilities(self.api.devices):
+                    _LOGGER.info("Watts On devices changed, reloading entry")
+                    self.hass.async_create_task(
+                        self.hass.config_entries.async_reload(self.entry.entry_id)
+                    )
+
             return data
 
+        except WattsOnAuthError as err:
+            raise ConfigEntryAuthFailed(err) from err
         except Exception as err:
             _LOGGER.error("Error fetching Watts On data: %s", err)
             raise UpdateFailed(err)
@@ -0,0 +1,149 @@
+"""Sensor descriptions for The Watts On integration."""
+
+from __future__ import annotations
+from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
+from homeassistant.const import UnitOfEnergy, UnitOfVolume, UnitOfVolumeFlowRate
+from .model import WattsOnSensorDescription
+
+# Needs an outdoor temperature entity, see build_sensor_descriptions
+DEGREE_DAY_KEY = "energy_per_degree_day"
+
+# Bucket sums: (key, name suffix). "statistics" is the base sensor, the rest are the grouped extras
+STATISTICS_KEYS: tuple[tuple[str, str], ...] = (
+    ("statistics", "statistics"),
+    ("statistics_day", "statistics day"),
+    ("statistics_week", "statistics week"),
+    ("statistics_month", "statistics month"),
+    ("statistics_year", "statistics year"),
+)
+
+
+def _water_descriptions() -> tuple[WattsOnSensorDescription, ...]:
+    statistics = tuple(
+        WattsOnSensorDescription(
+            sensor_type="water",
+            key=key,
+            name=f"Water {suffix}",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+            suggested_display_precision=3,
+            device_class=SensorDeviceClass.WATER,
+            icon="mdi:water",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        )
+        for key, suffix in STATISTICS_KEYS
+    )
+    analytics = (
+        WattsOnSensorDescription(
+            sensor_type="water",
+            key="average_7d",
+            name="Water daily average 7 days",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+            suggested_display_precision=3,
+            icon="mdi:water",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        WattsOnSensorDescription(
+            sensor_type="water",
+            key="average_30d",
+            name="Water daily average 30 days",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+            suggested_display_precision=3,
+            icon="mdi:water",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        WattsOnSensorDescription(
+            sensor_type="water",
+            key="flow_rate",
+            name="Water flow rate",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
+            suggested_display_precision=3,
+            device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+            icon="mdi:water-pump",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        WattsOnSensorDescription(
+            sensor_type="water",
+            key="night_flow",
+            name="Water night flow",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+            suggested_display_precision=3,
+            icon="mdi:pipe-leak",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    )
+    return statistics + analytics
+
+
+def _heating_descriptions() -> tuple[WattsOnSensorDescription, ...]:
+    statistics = tuple(
+        WattsOnSensorDescription(
+            sensor_type="heating",
+            key=key,
+            name=f"Heating {suffix}",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfEnergy.MEGA_WATT_HOUR,
+            suggested_display_precision=3,
+            device_class=SensorDeviceClass.ENERGY,
+            icon="mdi:heat-wave",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        )
+        for key, suffix in STATISTICS_KEYS
+    )
+    analytics = (
+        WattsOnSensorDescription(
+            sensor_type="heating",
+            key="average_7d",
+            name="Heating daily average 7 days",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfEnergy.MEGA_WATT_HOUR,
+            suggested_display_precision=3,
+            icon="mdi:heat-wave",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        WattsOnSensorDescription(
+            sensor_type="heating",
+            key="average_30d",
+            name="Heating daily average 30 days",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=UnitOfEnergy.MEGA_WATT_HOUR,
+            suggested_display_precision=3,
+            icon="mdi:heat-wave",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        WattsOnSensorDescription(
+            sensor_type="heating",
+            key=DEGREE_DAY_KEY,
+            name="Heating energy per degree-day",
+            entity_registry_enabled_default=True,
+            native_unit_of_measurement=f"{UnitOfEnergy.MEGA_WATT_HOUR}/DD",
+            suggested_display_precision=3,
+            icon="mdi:thermometer-lines",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    )
+    return statistics + analytics
+
+
+_BUILDERS = {
+    "water": _water_descriptions,
+    "heating": _heating_descriptions,
+}
+
+
+def build_sensor_descriptions(
+    sensor_type: str, degree_days: bool = False
+) -> tuple[WattsOnSensorDescription, ...]:
+    """Create the sensor descriptions for one utility type.
+
+    The energy per degree-day sensor needs an outdoor temperature entity, so it
+    is only included when degree_days is set.
+    """
+    descriptions = _BUILDERS[sensor_type]()
+    if degree_days:
+        return descriptions
+    return tuple(d for d in descriptions if d.key != DEGREE_DAY_KEY)
@@ -1,2 +1,3 @@
 """pywatts_on package"""
+from .exceptions import WattsOnAuthError, WattsOnNoDeviceError
 from .watts_on import WattsOnApi
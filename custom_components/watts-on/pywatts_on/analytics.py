@@ -0,0 +1,307 @@
+"""Incremental analytics for Watts On readings."""
+
+from __future__ import annotations
+import copy
+from collections import deque
+from datetime import datetime, timedelta, timezone, tzinfo
+
+# Base temperature for heating degree-days (Danish "graddage" standard)
+DEGREE_DAY_BASE = 17.0
+
+# Below this many degree-days in the window the energy ratio is too noisy to report
+MIN_DEGREE_DAYS = 1.0
+
+# Local hours (start inclusive, end exclusive) treated as the night window
+NIGHT_START_HOUR = 1
+NIGHT_END_HOUR = 5
+
+# Temperature samples further apart than this are not credited (e.g. after a restart)
+MAX_SAMPLE_GAP = timedelta(hours=6)
+
+# Period assumed for readings that do not carry an end date
+DEFAULT_PERIOD = timedelta(hours=1)
+
+
+def parse_reading(d: dict) -> tuple[datetime, float] | None:
+    """Return (timestamp, value) for a raw API reading, or None if unusable."""
+    # Zero readings matter here (night flow), so do not fall through on falsy values
+    ts = d.get("sd", d.get("SD"))
+    val = d.get("vol", d.get("En"))
+    if ts is None or val is None:
+        return None
+    try:
+        dt = _parse_timestamp(ts)
+        fval = float(val)
+    except Exception:
+        return None
+    if fval < 0:
+        return None
+    return dt, fval
+
+
+def reading_period(d: dict, start: datetime) -> timedelta:
+    """Return the period a reading covers, from its end date if present."""
+    end = d.get("ed", d.get("ED"))
+    if end is not None:
+        try:
+            period = _parse_timestamp(end) - start
+        except Exception:
+            period = None
+        if period and period > timedelta(0):
+            return period
+    return DEFAULT_PERIOD
+
+
+def settled_before(now: datetime) -> datetime:
+    """Return the cutoff before which readings are complete (UTC midnight, as in build_timeseries)."""
+    return datetime.combine(now.astimezone(timezone.utc).date(), datetime.min.time(), tzinfo=timezone.utc)
+
+
+def _parse_timestamp(ts) -> datetime:
+    if isinstance(ts, str):
+        return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+class RollingWindow:
+    """Running sum over a sliding time window, O(1) amortized per push."""
+
+    def __init__(self, window: timedelta):
+        self.window = window
+        self.total = 0.0
+        self._items: deque[tuple[datetime, float]] = deque()
+        self._end: datetime | None = None
+
+    def push(self, ts: datetime, value: float, period: timedelta = timedelta(0)) -> None:
+        """Add a value and evict everything that fell out of the window."""
+        self._items.append((ts, value))
+        self.total += value
+        self._end = ts + period
+        cutoff = ts - self.window
+        while self._items and self._items[0][0] <= cutoff:
+            self.total -= self._items.popleft()[1]
+
+    def daily_average(self, extra: list[tuple[datetime, float, timedelta]] = ()) -> float | None:
+        """
+        Return the average per day over the time the data actually covers.
+
+        extra holds provisional readings newer than the window contents. They
+        are included without being stored; only the items they would evict are
+        visited, so the cost is bounded by len(extra).
+        """
+        total = self.total
+        oldest = self._items[0][0] if self._items else None
+        end = self._end
+
+        if extra:
+            cutoff = extra[-1][0] - self.window
+            oldest = None
+            for ts, value in self._items:
+                if ts > cutoff:
+                    oldest = ts
+                    break
+                total -= value
+            total += sum(value for _, value, _ in extra)
+            if oldest is None:
+                oldest = extra[0][0]
+            end = extra[-1][0] + extra[-1][2]
+
+        if oldest is None:
+            return None
+        covered = min(end - oldest, self.window)
+        if covered <= timedelta(0):
+            return None
+        return total / (covered / timedelta(days=1))
+
+
+class NightFlowDetector:
+    """Track the minimum hourly flow of each night to spot continuous usage."""
+
+    def __init__(self, tz: tzinfo = timezone.utc):
+        self.tz = tz
+        self.last_night_min: float | None = None
+        self.last_night_date = None
+        self._night_date = None
+        self._night_min: float | None = None
+
+    def push(self, ts: datetime, value: float) -> None:
+        """Feed a reading; a night is finalized once a reading after it arrives."""
+        local = ts.astimezone(self.tz)
+        in_night = NIGHT_START_HOUR <= local.hour < NIGHT_END_HOUR
+
+        if self._night_date is not None and (not in_night or local.date() != self._night_date):
+            self.last_night_min = self._night_min
+            self.last_night_date = self._night_date
+            self._night_date = None
+            self._night_min = None
+
+        if in_night:
+            if self._night_date is None:
+                self._night_date = local.date()
+                self._night_min = value
+            else:
+                self._night_min = min(self._night_min, value)
+
+    def preview(self, extra: list[tuple[datetime, float, timedelta]]) -> NightFlowDetector:
+        """Return a copy that has also seen the provisional readings."""
+        detector = copy.copy(self)
+        for ts, value, _ in extra:
+            detector.push(ts, value)
+        return detector
+
+    @property
+    def leak_detected(self) -> bool:
+        """Return True if water flowed every hour of the last complete night."""
+        return bool(self.last_night_min and self.last_night_min > 0)
+
+
+class UtilityAnalytics:
+    """
+    Derived statistics for one utility, updated only with new readings.
+
+    Readings from before today (UTC) are committed to the rolling state once.
+    Today's readings may still be incomplete or revised, so they are kept as a
+    provisional tail that is re-read on every update and never committed.
+    """
+
+    def __init__(self, tz: tzinfo = timezone.utc):
+        self.last_ts: datetime | None = None
+        self.last_reading: tuple[datetime, float, timedelta] | None = None
+        self.week = RollingWindow(timedelta(days=7))
+        self.month = RollingWindow(timedelta(days=30))
+        self.night = NightFlowDetector(tz)
+        self.tail: list[tuple[datetime, float, timedelta]] = []
+
+    def update(self, data: list, now: datetime | None = None) -> list[tuple[datetime, float, timedelta]]:
+        """
+        Consume readings newer than the last committed one.
+
+        The API returns the full history in chronological order, so we walk
+        backwards until we reach already committed readings. Returns the
+        readings committed by this call.
+        """
+        cutoff = settled_before(now or datetime.now(timezone.utc))
+
+        new = []
+        for d in reversed(data):
+            parsed = parse_reading(d)
+            if parsed is None:
+                continue
+            ts, value = parsed
+            if self.last_ts is not None and ts <= self.last_ts:
+                break
+            new.append((ts, value, reading_period(d, ts)))
+        new.reverse()
+
+        committed = [r for r in new if r[0] < cutoff]
+        self.tail = [r for r in new if r[0] >= cutoff]
+
+        for ts, value, period in committed:
+            self.week.push(ts, value, period)
+            self.month.push(ts, value, period)
+            self.night.push(ts, value)
+            self.last_ts = ts
+            self.last_reading = (ts, value, period)
+
+        return committed
+
+    @property
+    def flow_rate(self) -> float | None:
+        """Return the latest reading divided by its own period, per hour."""
+        latest = self.tail[-1] if self.tail else self.last_reading
+        if latest is None:
+            return None
+        _, value, period = latest
+        return value / (period / timedelta(hours=1))
+
+    @property
+    def week_average(self) -> float | None:
+        return self.week.daily_average(self.tail)
+
+    @property
+    def month_average(self) -> float | None:
+        return self.month.daily_average(self.tail)
+
+    @property
+    def last_night(self) -> NightFlowDetector:
+        """Return the night-flow state including today's provisional readings."""
+        return self.night.preview(self.tail)
+
+
+class DegreeDays:
+    """Accumulate heating degree-days per hour from periodic outdoor temperature samples."""
+
+    def __init__(self, window: timedelta = timedelta(days=31), base: float = DEGREE_DAY_BASE):
+        self.base = base
+        self.window = window
+        self._hours: dict[datetime, float] = {}
+        self._order: deque[datetime] = deque()
+        self._last_ts: datetime | None = None
+
+    def push(self, ts: datetime, temperature: float) -> None:
+        """Credit the time since the previous sample to the hour it mostly fell in."""
+        if self._last_ts is not None and timedelta(0) < ts - self._last_ts <= MAX_SAMPLE_GAP:
+            days = (ts - self._last_ts) / timedelta(days=1)
+            hour = _floor_hour(self._last_ts + (ts - self._last_ts) / 2)
+            if hour not in self._hours:
+                self._hours[hour] = 0.0
+                self._order.append(hour)
+            self._hours[hour] += max(0.0, self.base - temperature) * days
+
+            cutoff = ts - self.window
+            while self._order and self._order[0] <= cutoff:
+                del self._hours[self._order.popleft()]
+        self._last_ts = ts
+
+    def as_dict(self) -> dict:
+        """Return the sampled hours in a JSON-serialisable form for storage."""
+        return {
+            "last_ts": self._last_ts.isoformat() if self._last_ts else None,
+            "hours": [[hour.isoformat(), self._hours[hour]] for hour in self._order],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, **kwargs) -> DegreeDays:
+        """Restore degree-days saved with as_dict."""
+        degree_days = cls(**kwargs)
+        for hour, value in data.get("hours", []):
+            hour = datetime.fromisoformat(hour)
+            degree_days._hours[hour] = value
+            degree_days._order.append(hour)
+        if data.get("last_ts"):
+            degree_days._last_ts = datetime.fromisoformat(data["last_ts"])
+        return degree_days
+
+    def between(self, start: datetime, end: datetime) -> float | None:
+        """Return degree-days for [start, end), or None if any hour was not sampled."""
+        total = 0.0
+        hour = _floor_hour(start)
+        while hour < end:
+            if hour not in self._hours:
+                return None
+            total += self._hours[hour]
+            hour += timedelta(hours=1)
+        return total
+
+
+class EnergyPerDegreeDay:
+    """Heating energy per degree-day over readings paired with sampled degree-days."""
+
+    def __init__(self, window: timedelta = timedelta(days=30)):
+        self.energy = RollingWindow(window)
+        self.degree_days = RollingWindow(window)
+
+    def push(self, ts: datetime, energy: float, degree_days: float) -> None:
+        """Add one reading together with the degree-days of the same period."""
+        self.energy.push(ts, energy)
+        self.degree_days.push(ts, degree_days)
+
+    @property
+    def value(self) -> float | None:
+        if self.degree_days.total < MIN_DEGREE_DAYS:
+            return None
+        return self.energy.total / self.degree_days.total
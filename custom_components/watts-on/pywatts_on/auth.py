@@ -0,0 +1,108 @@
+"""B2C PKCE login flow for the Watts On API."""
+
+from __future__ import annotations
+import base64
+import hashlib
+import os
+import re
+
+from .const import (
+    AUTH_URL,
+    CLIENT_ID,
+    CONFIRMED_URL,
+    POLICY,
+    REDIRECT_URI,
+    SCOPES,
+    SELFASSERTED_URL,
+    TOKEN_URL,
+)
+from .exceptions import WattsOnAuthError
+
+
+def _pkce_pair():
+    verifier = base64.urlsafe_b64encode(os.urandom(64)).decode().rstrip("=")
+    challenge = base64.urlsafe_b64encode(
+        hashlib.sha256(verifier.encode()).digest()
+    ).decode().rstrip("=")
+    return verifier, challenge
+
+
+def _first_match(pattern, text, group=1):
+    m = re.search(pattern, text)
+    return m.group(group) if m else None
+
+
+def _require(value, what):
+    if not value:
+        raise RuntimeError(f"Could not find {what}; login flow may have changed.")
+
+
+def login(session, username: str, password: str) -> dict:
+    """Do the full PKCE login flow and return fresh tokens."""
+    code_verifier, code_challenge = _pkce_pair()
+
+    # Start auth flow
+    auth_params = {
+        "client_id": CLIENT_ID,
+        "response_type": "code",
+        "redirect_uri": REDIRECT_URI,
+        "response_mode": "query",
+        "scope": SCOPES,
+        "code_challenge": code_challenge,
+        "code_challenge_method": "S256",
+        "prompt": "select_account",
+        "client_info": "1",
+    }
+    r = session.get(AUTH_URL, params=auth_params, allow_redirects=True, timeout=30)
+    r.raise_for_status()
+
+    # Extract StateProperties
+    tx_val = _first_match(r"StateProperties=([^&\"'<> ]+)", r.url) \
+        or _first_match(r"StateProperties=([^&\"'<> ]+)", r.text)
+    _require(tx_val, "StateProperties")
+
+    csrf_cookie = session.cookies.get("x-ms-cpim-csrf")
+    _require(csrf_cookie, "x-ms-cpim-csrf cookie")
+
+    # POST SelfAsserted with credentials
+    sa_params = {"tx": f"StateProperties={tx_val}", "p": POLICY}
+    sa_headers = {
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+        "X-Requested-With": "XMLHttpRequest",
+        "X-CSRF-TOKEN": csrf_cookie,
+        "Origin": "https://wattsenergyassistant.b2clogin.com",
+        "Referer": r.url.split("#")[0],
+    }
+    sa_payload = {"request_type": "RESPONSE", "signInName": username, "password": password}
+    sa = session.post(SELFASSERTED_URL, params=sa_params, data=sa_payload, headers=sa_headers, timeout=30)
+    if sa.status_code not in (200, 204):
+        raise RuntimeError(f"Login step failed: {sa.status_code} {sa.text[:200]}")
+    # B2C answers rejected credentials with HTTP 200 and a JSON status of 400
+    if _first_match(r"\"status\"\s*:\s*\"(\d+)\"", sa.text) == "400":
+        raise WattsOnAuthError("Invalid username or password")
+
+    # Confirm
+    conf_params = {"rememberMe": "false", "csrf_token": csrf_cookie, "tx": f"StateProperties={tx_val}", "p": POLICY}
+    conf = session.get(CONFIRMED_URL, params=conf_params, allow_redirects=False, timeout=30)
+    if conf.status_code not in (302, 303):
+        raise RuntimeError(f"Expected redirect, got {conf.status_code}")
+
+    redirect_url = conf.headers.get("Location", "")
+    _require(redirect_url, "redirect URL with code")
+    auth_code = _first_match(r"[?&]code=([^&\s\"'>]+)", redirect_url)
+    _require(auth_code, "authorization code")
+
+    # Exchange code for tokens
+    token_data = {
+        "grant_type": "authorization_code",
+        "client_id": CLIENT_ID,
+        "scope": SCOPES,
+        "code": auth_code,
+        "redirect_uri": REDIRECT_URI,
+        "code_verifier": code_verifier,
+    }
+    tok = session.post(TOKEN_URL, data=token_data, timeout=30)
+    if tok.status_code != 200:
+        raise RuntimeError(f"Token exchange failed: {tok.status_code} {tok.text[:200]}")
+
+    return tok.json()
@@ -0,0 +1,15 @@
+"""Azure AD B2C constants for the Watts On API."""
+
+TENANT = "wattsenergyassistant.onmicrosoft.com"
+POLICY = "b2c_1a_jitmigraion_signup_signin"
+CLIENT_ID = "a19dc71d-697e-451a-86c4-cc112b202c90"
+REDIRECT_URI = "msauth.com.seasnve.watts://auth"
+SCOPES = (
+    "https://wattsenergyassistant.onmicrosoft.com/"
+    "a19dc71d-697e-451a-86c4-cc112b202c90/Watts.API openid profile offline_access"
+)
+BASE_B2C = f"https://wattsenergyassistant.b2clogin.com/{TENANT}/{POLICY}"
+TOKEN_URL = f"{BASE_B2C}/oauth2/v2.0/token"
+AUTH_URL = f"{BASE_B2C}/oauth2/v2.0/authorize"
+SELFASSERTED_URL = f"{BASE_B2C}/SelfAsserted"
+CONFIRMED_URL = f"{BASE_B2C}/api/CombinedSigninAndSignup/confirmed"
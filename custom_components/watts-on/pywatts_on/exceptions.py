@@ -0,0 +1,9 @@
+"""Exceptions for the Watts On API."""
+
+
+class WattsOnAuthError(RuntimeError):
+    """Raised when the login is rejected because of bad credentials."""
+
+
+class WattsOnNoDeviceError(RuntimeError):
+    """Raised when the account has no device for the requested utility."""
@@ -0,0 +1,154 @@
+"""Chunked, resumable history export for Watts On readings."""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+
+from .analytics import parse_reading
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+DEFAULT_CHUNK = timedelta(days=31)
+
+
+def _progress_path(path: str) -> str:
+    return f"{path}.progress"
+
+
+def _load_progress(path: str) -> dict | None:
+    try:
+        with open(_progress_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_progress(path: str, progress: dict) -> None:
+    tmp = f"{_progress_path(path)}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(progress, f)
+    os.replace(tmp, _progress_path(path))
+
+
+def _output_matches(path: str, fmt: str, progress: dict) -> bool:
+    """Return True if the output on disk still holds what the progress file recorded."""
+    if fmt == "parquet":
+        return all(
+            os.path.exists(os.path.join(path, f"part-{i:05d}.parquet"))
+            for i in range(progress["index"])
+        )
+    if progress["offset"] == 0:
+        return True
+    return os.path.isfile(path) and os.path.getsize(path) >= progress["offset"]
+
+
+def _clear_output(path: str, fmt: str) -> None:
+    """Remove output left by a previous job before starting a fresh one."""
+    if fmt == "parquet":
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.startswith("part-") and name.endswith(".parquet"):
+                    os.remove(os.path.join(path, name))
+    elif os.path.isfile(path):
+        os.remove(path)
+
+
+def _write_text_chunk(path: str, fmt: str, rows: list[tuple[datetime, float]], offset: int) -> int:
+    """Append rows at byte offset (dropping any partial chunk) and return the new offset."""
+    mode = "r+" if os.path.exists(path) else "w"
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.seek(offset)
+        f.truncate()
+        if fmt == "csv" and offset == 0:
+            f.write("datetime,value\n")
+        for ts, value in rows:
+            if fmt == "csv":
+                f.write(f"{ts.isoformat()},{value}\n")
+            else:
+                f.write(json.dumps({"datetime": ts.isoformat(), "value": value}) + "\n")
+        return f.tell()
+
+
+def _write_parquet_chunk(path: str, index: int, rows: list[tuple[datetime, float]]) -> None:
+    """Write one chunk as its own part file inside the dataset directory."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise RuntimeError("Parquet export requires pyarrow to be installed") from err
+
+    os.makedirs(path, exist_ok=True)
+    table = pa.table(
+        {
+            "datetime": pa.array([ts for ts, _ in rows], type=pa.timestamp("s", tz="UTC")),
+            "value": pa.array([value for _, value in rows], type=pa.float64()),
+        }
+    )
+    pq.write_table(table, os.path.join(path, f"part-{index:05d}.parquet"))
+
+
+def export_history(
+    api,
+    utility: str,
+    path: str,
+    fmt: str,
+    start: datetime,
+    end: datetime,
+    chunk: timedelta = DEFAULT_CHUNK,
+    resume: bool = True,
+) -> int:
+    """
+    Stream readings for a utility to disk, one API request per chunk.
+
+    Only a single chunk of readings is held in memory at a time. Progress is
+    recorded next to the output after every chunk, so an interrupted export
+    continues where it stopped when run again with resume=True. Parquet output
+    is a directory with one part file per chunk.
+
+    Returns the number of rows written in this run.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    job = {"utility": utility, "format": fmt, "start": start.isoformat(), "end": end.isoformat()}
+    progress = _load_progress(path) if resume else None
+    if progress and progress.get("job") == job and _output_matches(path, fmt, progress):
+        cursor = datetime.fromisoformat(progress["cursor"])
+        offset = progress["offset"]
+        index = progress["index"]
+        _LOGGER.info("Resuming %s export to %s from %s", utility, path, cursor)
+    else:
+        cursor, offset, index = start, 0, 0
+        _clear_output(path, fmt)
+
+    written = 0
+    while cursor < end:
+        chunk_end = min(cursor + chunk, end)
+        rows = []
+        for d in api.fetch_readings(utility, cursor, chunk_end):
+            parsed = parse_reading(d)
+            if parsed is not None and cursor <= parsed[0] < chunk_end:
+                rows.append(parsed)
+        rows.sort(key=lambda r: r[0])
+
+        if rows:
+            if fmt == "parquet":
+                _write_parquet_chunk(path, index, rows)
+            else:
+                offset = _write_text_chunk(path, fmt, rows, offset)
+            written += len(rows)
+            index += 1
+
+        cursor = chunk_end
+        _save_progress(
+            path,
+            {"job": job, "cursor": cursor.isoformat(), "offset": offset, "index": index},
+        )
+        _LOGGER.debug("Exported %s %s rows up to %s", len(rows), utility, cursor)
+
+    if os.path.exists(_progress_path(path)):
+        os.remove(_progress_path(path))
+    return written
@@ -1,43 +1,81 @@
 """API client for Watts On integration."""
 
 from __future__ import annotations
-import base64
-from datetime import datetime, timedelta, timezone
-import hashlib
-import os
-import re
-import requests
+from datetime import datetime, timedelta, timezone, tzinfo
+import threading
 import time
 import logging
 from collections import defaultdict
 
+from .analytics import DegreeDays, EnergyPerDegreeDay, UtilityAnalytics
+from .const import CLIENT_ID, REDIRECT_URI, SCOPES, TOKEN_URL
+from .exceptions import WattsOnNoDeviceError
+
 _LOGGER = logging.getLogger(__name__)
 
-TENANT = "wattsenergyassistant.onmicrosoft.com"
-POLICY = "b2c_1a_jitmigraion_signup_signin"
-CLIENT_ID = "a19dc71d-697e-451a-86c4-cc112b202c90"
-REDIRECT_URI = "msauth.com.seasnve.watts://auth"
-SCOPES = (
-    "https://wattsenergyassistant.onmicrosoft.com/"
-    "a19dc71d-697e-451a-86c4-cc112b202c90/Watts.API openid profile offline_access"
-)
-BASE_B2C = f"https://wattsenergyassistant.b2clogin.com/{TENANT}/{POLICY}"
-TOKEN_URL = f"{BASE_B2C}/oauth2/v2.0/token"
-AUTH_URL = f"{BASE_B2C}/oauth2/v2.0/authorize"
-SELFASSERTED_URL = f"{BASE_B2C}/SelfAsserted"
-CONFIRMED_URL = f"{BASE_B2C}/api/CombinedSigninAndSignup/confirmed"
+API_DATE_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+HISTORY_START = datetime(1900, 1, 1, tzinfo=timezone.utc)
+HISTORY_END = datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+# How often to look again for a utility that had no device on the account
+DEVICE_REFRESH_INTERVAL = 24 * 60 * 60
 
 
 class WattsOnApi:
     """Watts On API client with token persistence support."""
 
-    def __init__(self, username: str, password: str, tokens: dict | None = None):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        tokens: dict | None = None,
+        time_zone: tzinfo | None = None,
+        devices: dict | None = None,
+        degree_days: dict | None = None,
+    ):
         self.username = username
         self.password = password
-        self.water_device_id: str | None = None
-        self.heating_device_id: str | None = None
+        # None means "not looked up yet", "" means "no such device on the account"
+        self.water_device_id: str | None = (devices or {}).get("water")
+        self.heating_device_id: str | None = (devices or {}).get("heating")
+        self.devices_checked_at: float = (devices or {}).get("checked_at", 0.0)
         self.tokens: dict | None = tokens
-        self.session = requests.Session()
+        # One session per thread: the coordinator and the export service run in
+        # different executor threads, and the B2C login relies on the cookie jar
+        self._local = threading.local()
+        # The coordinator and the export service call ensure_token from different threads
+        self._token_lock = threading.Lock()
+        self.water_analytics = UtilityAnalytics(time_zone or timezone.utc)
+        self.heating_analytics = UtilityAnalytics(time_zone or timezone.utc)
+        # Restored from storage so readings can be paired across restarts
+        self.degree_days = DegreeDays.from_dict(degree_days) if degree_days else DegreeDays()
+        self.energy_per_degree_day = EnergyPerDegreeDay()
+
+    @property
+    def session(self):
+        """Return this thread's HTTP session, importing requests on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = self._local.session = requests.Session()
+        return session
+
+    @property
+    def devices(self) -> dict:
+        """Return the discovered device map, suitable for storing in the config entry."""
+        return {
+            "water": self.water_device_id,
+            "heating": self.heating_device_id,
+            "checked_at": self.devices_checked_at,
+        }
+
+    def discovered_utilities(self) -> list[str]:
+        """Return utility types with a device, or all of them if discovery has not run."""
+        if self.water_device_id is None and self.heating_device_id is None:
+            return ["water", "heating"]
+        devices = (("water", self.water_device_id), ("heating", self.heating_device_id))
+        return [utility for utility, device_id in devices if device_id]
 
     def _is_token_valid(self) -> bool:
         """Check if access token is still valid."""
@@ -48,6 +86,10 @@ class WattsOnApi:
 
     def ensure_token(self) -> str:
         """Return a valid access token (refresh or login if needed)."""
+        with self._token_lock:
+            return self._ensure_token()
+
+    def _ensure_token(self) -> str:
         if self._is_token_valid():
             return self.tokens["access_token"]
 
@@ -78,88 +120,13 @@ class WattsOnApi:
         self.tokens = self.login()
         return self.tokens["access_token"]
     
-    def _pkce_pair(self):
-        verifier = base64.urlsafe_b64encode(os.urandom(64)).decode().rstrip("=")
-        challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(verifier.encode()).digest()
-        ).decode().rstrip("=")
-        return verifier, challenge
-
-    def _first_match(self, pattern, text, group=1):
-        m = re.search(pattern, text)
-        return m.group(group) if m else None
-
-    def _require(self, value, what):
-        if not value:
-            raise RuntimeError(f"Could not find {what}; login flow may have changed.")
-
     def login(self) -> dict:
         """Do the full PKCE login flow and return fresh tokens."""
-        code_verifier, code_challenge = self._pkce_pair()
-
-        # Start auth flow
-        auth_params = {
-            "client_id": CLIENT_ID,
-            "response_type": "code",
-            "redirect_uri": REDIRECT_URI,
-            "response_mode": "query",
-            "scope": SCOPES,
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256",
-            "prompt": "select_account",
-            "client_info": "1",
-        }
-        r = self.session.get(AUTH_URL, params=auth_params, allow_redirects=True, timeout=30)
-        r.raise_for_status()
-
-        # Extract StateProperties
-        tx_val = self._first_match(r"StateProperties=([^&\"'<> ]+)", r.url) \
-            or self._first_match(r"StateProperties=([^&\"'<> ]+)", r.text)
-        self._require(tx_val, "StateProperties")
-
-        csrf_cookie = self.session.cookies.get("x-ms-cpim-csrf")
-        self._require(csrf_cookie, "x-ms-cpim-csrf cookie")
-
-        # POST SelfAsserted with credentials
-        sa_params = {"tx": f"StateProperties={tx_val}", "p": POLICY}
-        sa_headers = {
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "X-Requested-With": "XMLHttpRequest",
-            "X-CSRF-TOKEN": csrf_cookie,
-            "Origin": "https://wattsenergyassistant.b2clogin.com",
-            "Referer": r.url.split("#")[0],
-        }
-        sa_payload = {"request_type": "RESPONSE", "signInName": self.username, "password": self.password}
-        sa = self.session.post(SELFASSERTED_URL, params=sa_params, data=sa_payload, headers=sa_headers, timeout=30)
-        if sa.status_code not in (200, 204):
-            raise RuntimeError(f"Login step failed: {sa.status_code} {sa.text[:200]}")
-
-        # Confirm
-        conf_params = {"rememberMe": "false", "csrf_token": csrf_cookie, "tx": f"StateProperties={tx_val}", "p": POLICY}
-        conf = self.session.get(CONFIRMED_URL, params=conf_params, allow_redirects=False, timeout=30)
-        if conf.status_code not in (302, 303):
-            raise RuntimeError(f"Expected redirect, got {conf.status_code}")
-
-        redirect_url = conf.headers.get("Location", "")
-        self._require(redirect_url, "redirect URL with code")
-        auth_code = self._first_match(r"[?&]code=([^&\s\"'>]+)", redirect_url)
-        self._require(auth_code, "authorization code")
-
-        # Exchange code for tokens
-        token_data = {
-            "grant_type": "authorization_code",
-            "client_id": CLIENT_ID,
-            "scope": SCOPES,
-            "code": auth_code,
-            "redirect_uri": REDIRECT_URI,
-            "code_verifier": code_verifier,
-        }
-        tok = self.session.post(TOKEN_URL, data=token_data, timeout=30)
-        if tok.status_code != 200:
-            raise RuntimeError(f"Token exchange failed: {tok.status_code} {tok.text[:200]}")
+        # The B2C login machinery is only needed when tokens are missing or expired
+        from .auth import login
+
+        return login(self.session, self.username, self.password)
 
-        return tok.json()
-    
     def build_timeseries(self, data, interval: str = "daily"):
         """
         Build time-series statistics.
@@ -234,11 +201,20 @@ class WattsOnApi:
         return stats
 
     
+    def _ensure_devices(self) -> None:
+        """Look up devices if unknown, and re-check missing ones once a day."""
+        ids = (self.water_device_id, self.heating_device_id)
+        if None in ids or (
+            "" in ids and time.time() - self.devices_checked_at >= DEVICE_REFRESH_INTERVAL
+        ):
+            self.fetch_devices()
+
     def fetch_devices(self):
+        self.devices_checked_at = time.time()
         url = "https://p.watts-energy.dk/provisioning/api/v1/locations"
         headers = {"Authorization": f"Bearer {self.tokens['access_token']}"}
         try:
-            json_response = requests.get(url, headers=headers, timeout=30).json()
+            json_response = self.session.get(url, headers=headers, timeout=30).json()
             devices = json_response[0]["devices"]
             heating_devices = [d for d in devices if "heating" in d["utilityType"].lower()]
             if len(heating_devices) > 0:
@@ -253,43 +229,103 @@ class WattsOnApi:
         except Exception as e:
             return
 
-    def fetch_water(self, token: str):
+    def fetch_water(self, token: str, start: datetime = HISTORY_START, end: datetime = HISTORY_END):
         """Fetch water data from API."""
-        if not self.water_device_id:
-            self.fetch_devices()
+        self._ensure_devices()
         if self.water_device_id and self.water_device_id != "":
             return self.session.get(
                 f"https://p.watts-energy.dk/water/api/data/{self.water_device_id}",
                 headers={"Authorization": f"Bearer {token}"},
                 params={
-                    "startDate": "1900-01-01 00:00:00 +0000",
-                    "endDate": "2100-01-01 00:00:00 +0000",
+                    "startDate": start.strftime(API_DATE_FORMAT),
+                    "endDate": end.strftime(API_DATE_FORMAT),
                 },
                 timeout=30,
             ).json()
         else:
             return {}
 
-    def fetch_heating(self, token: str):
+    def fetch_heating(self, token: str, start: datetime = HISTORY_START, end: datetime = HISTORY_END):
         """Fetch heating data from API."""
-        if not self.heating_device_id:
-            self.fetch_devices()
+        self._ensure_devices()
         if self.heating_device_id and self.heating_device_id != "":
             return self.session.get(
                 f"https://p.watts-energy.dk/heating/api/v1/devices/{self.heating_device_id}/data",
                 headers={"Authorization": f"Bearer {token}"},
                 params={
-                    "fromDate": "1900-01-01 00:00:00 +0000",
-                    "toDate": "2100-01-01 00:00:00 +0000",
+                    "fromDate": start.strftime(API_DATE_FORMAT),
+                    "toDate": end.strftime(API_DATE_FORMAT),
                 },
                 timeout=30,
             ).json()
         else:
             return {}
     
-    def fetch_data(self) -> dict:
+    def build_analytics(self) -> dict:
+        """
+        Build derived sensor values from the incremental analytics state.
+
+        Each entry is a dict with a "value" and optional extra attributes.
+        """
+        water = self.water_analytics
+        heating = self.heating_analytics
+        night = water.last_night
+
+        def _round(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            "water": {
+                "average_7d": {"value": _round(water.week_average)},
+                "average_30d": {"value": _round(water.month_average)},
+                "flow_rate": {"value": _round(water.flow_rate)},
+                "night_flow": {
+                    "value": _round(night.last_night_min),
+                    "night": night.last_night_date.isoformat() if night.last_night_date else None,
+                    "leak_detected": night.leak_detected,
+                },
+            },
+            "heating": {
+                "average_7d": {"value": _round(heating.week_average)},
+                "average_30d": {"value": _round(heating.month_average)},
+                "energy_per_degree_day": {
+                    "value": _round(self.energy_per_degree_day.value),
+                    "degree_days": _round(self.energy_per_degree_day.degree_days.total),
+                },
+            },
+        }
+
+    def require_device(self, utility: str) -> str:
+        """Return the device id for a utility, raising if the account has none."""
+        if utility not in ("water", "heating"):
+            raise ValueError(f"Unknown utility: {utility}")
+        self.ensure_token()
+        self._ensure_devices()
+        device_id = self.water_device_id if utility == "water" else self.heating_device_id
+        if device_id is None:
+            raise RuntimeError("Could not look up devices on the account")
+        if not device_id:
+            raise WattsOnNoDeviceError(f"No {utility} meter on this account")
+        return device_id
+
+    def fetch_readings(self, utility: str, start: datetime, end: datetime) -> list:
+        """Fetch raw readings for one utility ('water' or 'heating') in [start, end)."""
+        self.require_device(utility)
+        token = self.ensure_token()
+        if utility == "water":
+            raw = self.fetch_water(token, start, end)
+        elif utility == "heating":
+            raw = self.fetch_heating(token, start, end)
+        else:
+            raise ValueError(f"Unknown utility: {utility}")
+        return raw if isinstance(raw, list) else raw.get("data", [])
+
+    def fetch_data(self, outdoor_temperature: float | None = None) -> dict:
         """
         Fetch cumulative water and heating statistics.
+
+        Args:
+            outdoor_temperature: Current outdoor temperature in °C, used for degree-days.
         """
         token = self.ensure_token()
         raw_heating = self.fetch_heating(token)
@@ -298,6 +334,16 @@ class WattsOnApi:
         heating_data = raw_heating if isinstance(raw_heating, list) else raw_heating.get("data", [])
         water_data = raw_water if isinstance(raw_water, list) else raw_water.get("data", [])
 
+        if outdoor_temperature is not None:
+            self.degree_days.push(datetime.now(timezone.utc), outdoor_temperature)
+        self.water_analytics.update(water_data)
+        # Pair heating energy with degree-days sampled over the same period
+        for ts, energy, period in self.heating_analytics.update(heating_data):
+            degree_days = self.degree_days.between(ts, ts + period)
+            if degree_days is not None:
+                self.energy_per_degree_day.push(ts, energy, degree_days)
+        analytics = self.build_analytics()
+
         return {
             "water": {
                 "statistics_raw": self.build_timeseries(water_data, "raw"),
@@ -305,6 +351,7 @@ class WattsOnApi:
                 "statistics_week": self.build_timeseries(water_data, "weekly"),
                 "statistics_month": self.build_timeseries(water_data, "monthly"),
                 "statistics_year": self.build_timeseries(water_data, "yearly"),
+                **analytics["water"],
             },
             "heating": {
                 "statistics_raw": self.build_timeseries(heating_data, "raw"),
@@ -312,5 +359,6 @@ class WattsOnApi:
                 "statistics_week": self.build_timeseries(heating_data, "weekly"),
                 "statistics_month": self.build_timeseries(heating_data, "monthly"),
                 "statistics_year": self.build_timeseries(heating_data, "yearly"),
+                **analytics["heating"],
             },
         }
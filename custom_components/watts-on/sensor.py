@@ -6,12 +6,14 @@ import logging
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, DEFAULT_NAME, WATER_SENSOR_TYPES, EXTRA_WATER_SENSOR_TYPES, HEATING_SENSOR_TYPES, EXTRA_HEATING_SENSOR_TYPES
+from .const import DOMAIN, DEFAULT_NAME, UTILITY_TYPES
+from .descriptions import build_sensor_descriptions
 from .model import WattsOnSensorDescription
-from .coordinator import WattsOnUpdateCoordinator
+from .coordinator import WattsOnUpdateCoordinator, get_outdoor_temperature_entity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,22 +25,36 @@ async def async_setup_entry(
     """Set up Watts On sensors based on a config entry."""
 
     coordinator: WattsOnUpdateCoordinator = hass.data[DOMAIN][config.entry_id]["coordinator"]
+    api = hass.data[DOMAIN][config.entry_id]["api"]
 
     sensors = []
 
-    # Combine base and extra sensors - EXTRA is in case we want to have a flag for grouped sensors
-    all_water_sensors = WATER_SENSOR_TYPES + EXTRA_WATER_SENSOR_TYPES
-    all_heating_sensors = HEATING_SENSOR_TYPES + EXTRA_HEATING_SENSOR_TYPES
+    # Only create descriptions for the utilities that have a device on the account
+    degree_days = bool(get_outdoor_temperature_entity(config))
+    for sensor_type in api.discovered_utilities():
+        for description in build_sensor_descriptions(sensor_type, degree_days):
+            sensors.append(WattsOnSensor(DEFAULT_NAME, coordinator, description))
 
-    # Add water sensors
-    for description in all_water_sensors:
-        sensors.append(WattsOnSensor(DEFAULT_NAME, coordinator, description))
+    async_add_entities(sensors, True)
 
-    # Add heating sensors
-    for description in all_heating_sensors:
-        sensors.append(WattsOnSensor(DEFAULT_NAME, coordinator, description))
+    # Earlier versions created every sensor; drop the ones that are no longer provided
+    created = {sensor.unique_id for sensor in sensors}
+    registry = er.async_get(hass)
+    for sensor_type in UTILITY_TYPES:
+        for description in build_sensor_descriptions(sensor_type, degree_days=True):
+            unique_id = _unique_id(DEFAULT_NAME, description)
+            if unique_id in created:
+                continue
+            entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+            entry = registry.async_get(entity_id) if entity_id else None
+            if entry and entry.config_entry_id == config.entry_id:
+                _LOGGER.debug("Removing sensor %s that is no longer provided", entity_id)
+                registry.async_remove(entity_id)
+
+
+def _unique_id(name: str, description: WattsOnSensorDescription) -> str:
+    return f"{name.lower()}-{description.sensor_type}-{description.key}"
 
-    async_add_entities(sensors, True)
 
 class WattsOnSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Watts On sensor."""
@@ -50,7 +66,7 @@ class WattsOnSensor(CoordinatorEntity, SensorEntity):
         self.entity_description = description
         self._attrs: dict[str, Any] = {}
         self._attr_name = f"{name} {description.name}"
-        self._attr_unique_id = f"{name.lower()}-{description.sensor_type}-{description.key}"
+        self._attr_unique_id = _unique_id(name, description)
 
     @property
     def native_value(self):
@@ -62,6 +78,10 @@ class WattsOnSensor(CoordinatorEntity, SensorEntity):
         section = data.get(self.entity_description.sensor_type, {})
         series = section.get(self.entity_description.key, [])
 
+        if isinstance(series, dict):
+            # Derived analytics are a single dict with 'value' (None until known)
+            return series.get("value")
+
         if isinstance(series, list) and series:
             # Expect each entry to be a dict with 'value'
             last = series[-1]
@@ -78,6 +98,10 @@ class WattsOnSensor(CoordinatorEntity, SensorEntity):
         section = data.get(self.entity_description.sensor_type, {})
         series = section.get(self.entity_description.key, [])
 
+        if isinstance(series, dict):
+            attrs = {k: v for k, v in series.items() if k != "value"}
+            return attrs or None
+
         if isinstance(series, list) and series:
             return {"data": series}
         return None
@@ -0,0 +1,93 @@
+"""Services for The Watts On integration."""
+
+from __future__ import annotations
+from datetime import timedelta
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.service import async_set_service_schema
+from homeassistant.util import dt as dt_util
+from homeassistant.util.yaml import load_yaml
+
+from .const import DOMAIN, EXPORT_DIR, SERVICE_DOMAIN, SERVICE_EXPORT_HISTORY, UTILITY_TYPES
+from .pywatts_on.export import EXPORT_FORMATS, export_history
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("utility"): vol.In(UTILITY_TYPES),
+        vol.Required("start_date"): cv.date,
+        vol.Optional("end_date"): cv.date,
+        vol.Optional("format", default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional("filename"): cv.string,
+        vol.Optional("resume", default=True): cv.boolean,
+        vol.Optional("config_entry_id"): cv.string,
+    }
+)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Watts On services once for all config entries."""
+    if hass.services.has_service(SERVICE_DOMAIN, SERVICE_EXPORT_HISTORY):
+        return
+
+    async def async_export_history(call: ServiceCall) -> None:
+        """Export readings for a utility to a file in the config dir."""
+        entries = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get("config_entry_id") or next(iter(entries), None)
+        if entry_id not in entries:
+            raise HomeAssistantError("No loaded Watts On config entry found")
+        api = entries[entry_id]["api"]
+
+        utility = call.data["utility"]
+        fmt = call.data["format"]
+        # Days are local days, like the sensor timestamps and night-flow analytics
+        start = dt_util.start_of_local_day(call.data["start_date"])
+        end_date = call.data.get("end_date") or dt_util.now().date()
+        end = dt_util.start_of_local_day(end_date + timedelta(days=1))
+        if start >= end:
+            raise HomeAssistantError("start_date must be before end_date")
+
+        filename = call.data.get("filename") or (
+            f"{utility}_{start.date().isoformat()}_{end_date.isoformat()}.{fmt}"
+        )
+        export_dir = hass.config.path(EXPORT_DIR)
+        path = os.path.realpath(os.path.join(export_dir, filename))
+        # Rejects directories, "", "." and ".." as well as symlinks out of the folder
+        if os.path.dirname(path) != os.path.realpath(export_dir):
+            raise HomeAssistantError("filename must be a plain file name")
+
+        def _run() -> int:
+            api.require_device(utility)
+            os.makedirs(export_dir, exist_ok=True)
+            return export_history(api, utility, path, fmt, start, end, resume=call.data["resume"])
+
+        try:
+            rows = await hass.async_add_executor_job(_run)
+        except Exception as err:
+            raise HomeAssistantError(f"Export of {utility} history failed: {err}") from err
+        _LOGGER.info("Exported %s %s readings to %s", rows, utility, path)
+
+    hass.services.async_register(
+        SERVICE_DOMAIN, SERVICE_EXPORT_HISTORY, async_export_history, schema=EXPORT_HISTORY_SCHEMA
+    )
+
+    # services.yaml is only picked up for the integration domain, so attach it explicitly
+    descriptions = await hass.async_add_executor_job(
+        load_yaml, os.path.join(os.path.dirname(__file__), "services.yaml")
+    )
+    async_set_service_schema(
+        hass, SERVICE_DOMAIN, SERVICE_EXPORT_HISTORY, descriptions[SERVICE_EXPORT_HISTORY]
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove Watts On services when the last config entry is unloaded."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(SERVICE_DOMAIN, SERVICE_EXPORT_HISTORY)
@@ -0,0 +1,51 @@
+"""Measure import cost of the Watts On integration with `python -X importtime`.
+
+Usage:
+    python scripts/importtime.py [module ...]
+
+Defaults to the API client package (imported as top-level `pywatts_on`, so
+Home Assistant is not needed). Pass e.g. `custom_components.watts-on` to
+measure the integration itself in an environment with Home Assistant.
+"""
+
+from __future__ import annotations
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTEGRATION_DIR = os.path.join(ROOT, "custom_components", "watts-on")
+DEFAULT_MODULES = ["pywatts_on"]
+WATCHED = ("requests", "numpy", "pyarrow", "pywatts_on.auth", "pywatts_on.export")
+
+
+def measure(module: str) -> None:
+    """Import module in a fresh interpreter and report its cumulative cost."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"__import__({module!r})"],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([ROOT, INTEGRATION_DIR])},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(f"{module}: import failed\n{proc.stderr.strip().splitlines()[-1]}")
+        return
+
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+
+    total = cumulative.get(module, 0)
+    print(f"{module}: {total / 1000:.1f} ms cumulative")
+    loaded = [name for name in WATCHED if name in cumulative]
+    print(f"  heavy/optional modules loaded: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    for mod in sys.argv[1:] or DEFAULT_MODULES:
+        measure(mod)
@@ -0,0 +1,9 @@
+"""Test configuration for The Watts On integration."""
+
+import os
+import sys
+
+# pywatts_on has no Home Assistant dependency; import it as a top-level package
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "custom_components", "watts-on")
+)
@@ -0,0 +1,184 @@
+"""Tests for the incremental analytics."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pywatts_on.analytics import (
+    DegreeDays,
+    EnergyPerDegreeDay,
+    NightFlowDetector,
+    RollingWindow,
+    UtilityAnalytics,
+)
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def reading(ts, value, key="vol"):
+    return {"sd": ts.isoformat(), key: value}
+
+
+def hourly(start, hours, value):
+    return [reading(start + i * HOUR, value) for i in range(hours)]
+
+
+def test_rolling_window_evicts_old_items():
+    window = RollingWindow(timedelta(days=7))
+    for i in range(10):
+        window.push(T0 + timedelta(days=i), 1.0, timedelta(days=1))
+    assert window.total == pytest.approx(7.0)
+    assert window.daily_average() == pytest.approx(1.0)
+
+
+def test_rolling_window_averages_over_covered_time():
+    window = RollingWindow(timedelta(days=7))
+    window.push(T0, 0.5, HOUR)
+    window.push(T0 + HOUR, 0.5, HOUR)
+    # 1.0 over two hours is 12 per day, not 1/7 per day
+    assert window.daily_average() == pytest.approx(12.0)
+
+
+def test_rolling_window_empty():
+    assert RollingWindow(timedelta(days=7)).daily_average() is None
+
+
+def test_update_is_incremental():
+    analytics = UtilityAnalytics()
+    now = T0 + timedelta(days=40)
+    data = hourly(T0, 24 * 40, 0.01)
+    assert len(analytics.update(data, now)) == 24 * 40
+    assert analytics.update(data, now) == []
+    assert analytics.week_average == pytest.approx(0.24)
+    assert analytics.month_average == pytest.approx(0.24)
+
+
+def test_todays_readings_are_provisional_and_can_be_revised():
+    analytics = UtilityAnalytics()
+    today = T0 + timedelta(days=1)
+    now = today + timedelta(hours=3)
+    data = hourly(T0, 24, 0.0) + [reading(today, 1.0), reading(today + HOUR, 1.0)]
+    analytics.update(data, now)
+    assert analytics.week.total == pytest.approx(0.0)
+    assert analytics.flow_rate == pytest.approx(1.0)
+
+    data[-1] = reading(today + HOUR, 5.0)
+    analytics.update(data, now)
+    assert analytics.flow_rate == pytest.approx(5.0)
+    assert analytics.week_average == pytest.approx(6.0 / (26 / 24))
+
+    # Once the day is over the revised value is committed
+    analytics.update(data, today + timedelta(days=1, hours=1))
+    assert analytics.week.total == pytest.approx(6.0)
+
+
+def test_flow_rate_uses_reading_period_not_gap():
+    analytics = UtilityAnalytics()
+    data = [reading(T0, 0.2), reading(T0 + 9 * HOUR, 1.0)]
+    analytics.update(data, T0 + timedelta(days=2))
+    assert analytics.flow_rate == pytest.approx(1.0)
+
+
+def test_flow_rate_uses_end_date_when_present():
+    analytics = UtilityAnalytics()
+    data = [{"sd": T0.isoformat(), "ed": (T0 + 2 * HOUR).isoformat(), "vol": 1.0}]
+    analytics.update(data, T0 + timedelta(days=2))
+    assert analytics.flow_rate == pytest.approx(0.5)
+
+
+def test_night_is_finished_by_first_reading_after_window():
+    detector = NightFlowDetector(timezone.utc)
+    for hour in range(1, 5):
+        detector.push(T0.replace(hour=hour), 0.01)
+    assert detector.last_night_min is None
+
+    detector.push(T0.replace(hour=5), 0.0)
+    assert detector.last_night_min == pytest.approx(0.01)
+    assert detector.last_night_date == T0.date()
+    assert detector.leak_detected
+
+
+def test_night_with_an_idle_hour_is_not_a_leak():
+    analytics = UtilityAnalytics()
+    data = hourly(T0, 24, 0.01)
+    data[3] = reading(T0.replace(hour=3), 0)
+    analytics.update(data, T0 + timedelta(days=2))
+    assert analytics.last_night.last_night_min == 0.0
+    assert not analytics.last_night.leak_detected
+
+
+def test_degree_days_between_requires_every_hour_sampled():
+    degree_days = DegreeDays()
+    for i in range(5):
+        degree_days.push(T0 + i * timedelta(minutes=30), 7.0)
+    # 10 degrees below base for two hours
+    assert degree_days.between(T0, T0 + 2 * HOUR) == pytest.approx(10 * 2 / 24)
+    assert degree_days.between(T0, T0 + 3 * HOUR) is None
+
+
+def test_degree_days_ignore_long_gaps():
+    degree_days = DegreeDays()
+    degree_days.push(T0, 7.0)
+    degree_days.push(T0 + timedelta(hours=12), 7.0)
+    assert degree_days.between(T0, T0 + HOUR) is None
+
+
+def test_energy_per_degree_day_pairs_same_period():
+    # 0.1 MWh/day at 7 degrees is 0.01 MWh per degree-day
+    ratio = EnergyPerDegreeDay()
+    assert ratio.value is None
+    for i in range(48):
+        ratio.push(T0 + i * HOUR, 0.1 / 24, 10 / 24)
+    assert ratio.value == pytest.approx(0.01)
+
+
+def test_energy_per_degree_day_unknown_until_periods_overlap():
+    from pywatts_on import WattsOnApi
+
+    api = WattsOnApi("user", "pass", tokens={"access_token": "x", "expires_on": 2**40})
+    api.water_device_id = ""
+    start = datetime.now(timezone.utc) - timedelta(days=60)
+    heating = [reading(start + i * HOUR, 0.1 / 24, key="En") for i in range(24 * 60)]
+    api.fetch_heating = lambda token: heating
+    api.fetch_water = lambda token: []
+
+    for _ in range(2):
+        data = api.fetch_data(outdoor_temperature=7.0)
+    # History from before the temperature samples must not be divided by them
+    assert data["heating"]["energy_per_degree_day"]["value"] is None
+
+
+def test_degree_days_survive_round_trip():
+    degree_days = DegreeDays()
+    for i in range(5):
+        degree_days.push(T0 + i * timedelta(minutes=30), 7.0)
+    restored = DegreeDays.from_dict(degree_days.as_dict())
+    assert restored.between(T0, T0 + 2 * HOUR) == pytest.approx(degree_days.between(T0, T0 + 2 * HOUR))
+    # The restored last sample lets the next sample be credited
+    restored.push(T0 + timedelta(hours=2, minutes=30), 7.0)
+    assert restored.between(T0, T0 + 3 * HOUR) is not None
+
+
+def test_restored_degree_days_pair_history_after_restart():
+    from pywatts_on import WattsOnApi
+
+    midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = midnight - timedelta(days=2)
+    degree_days = DegreeDays()
+    for i in range(2 * 48 + 1):
+        degree_days.push(start + i * timedelta(minutes=30), 7.0)
+
+    api = WattsOnApi(
+        "user",
+        "pass",
+        tokens={"access_token": "x", "expires_on": 2**40},
+        degree_days=degree_days.as_dict(),
+    )
+    api.water_device_id = ""
+    heating = [reading(start + i * HOUR, 0.1 / 24, key="En") for i in range(48)]
+    api.fetch_heating = lambda token: heating
+    api.fetch_water = lambda token: []
+
+    data = api.fetch_data()
+    assert data["heating"]["energy_per_degree_day"]["value"] == pytest.approx(0.01)
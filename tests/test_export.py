@@ -0,0 +1,65 @@
+"""Tests for the chunked history export."""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from pywatts_on.export import export_history
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeApi:
+    """Return one reading per hour, optionally failing on a given call."""
+
+    def __init__(self, fail_on=None, empty=False):
+        self.calls = 0
+        self.fail_on = fail_on
+        self.empty = empty
+
+    def fetch_readings(self, utility, start, end):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("boom")
+        if self.empty:
+            return []
+        readings, ts = [], start
+        while ts < end:
+            readings.append({"sd": ts.isoformat(), "vol": 0.5})
+            ts += timedelta(hours=1)
+        return readings
+
+
+def test_resume_continues_after_failure(tmp_path):
+    path = str(tmp_path / "water.csv")
+    end = T0 + timedelta(days=100)
+    try:
+        export_history(FakeApi(fail_on=3), "water", path, "csv", T0, end)
+    except RuntimeError:
+        pass
+    export_history(FakeApi(), "water", path, "csv", T0, end)
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "datetime,value"
+    assert len(lines) == 1 + 100 * 24
+    assert not os.path.exists(f"{path}.progress")
+
+
+def test_missing_output_discards_progress(tmp_path):
+    path = str(tmp_path / "water.ndjson")
+    end = T0 + timedelta(days=100)
+    try:
+        export_history(FakeApi(fail_on=3), "water", path, "ndjson", T0, end)
+    except RuntimeError:
+        pass
+    os.remove(path)
+    assert export_history(FakeApi(), "water", path, "ndjson", T0, end) == 100 * 24
+    with open(path, "rb") as f:
+        assert not f.read().startswith(b"\0")
+
+
+def test_fresh_job_clears_previous_output(tmp_path):
+    path = str(tmp_path / "water.csv")
+    end = T0 + timedelta(days=2)
+    export_history(FakeApi(), "water", path, "csv", T0, end)
+    assert export_history(FakeApi(empty=True), "water", path, "csv", T0, end, resume=False) == 0
+    assert not os.path.exists(path)
@@ -0,0 +1,21 @@
+"""Tests that importing pywatts_on stays cheap."""
+
+import os
+import subprocess
+import sys
+
+INTEGRATION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "custom_components", "watts-on"
+)
+
+
+def test_import_does_not_load_optional_modules():
+    code = (
+        "import sys, pywatts_on\n"
+        "loaded = [m for m in ('requests', 'pywatts_on.auth', 'pywatts_on.export') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    # A fresh interpreter, since other tests import these modules
+    env = {**os.environ, "PYTHONPATH": INTEGRATION_DIR}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
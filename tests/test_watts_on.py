@@ -0,0 +1,48 @@
+"""Tests for the Watts On API client."""
+
+import time
+
+import pytest
+
+from pywatts_on import WattsOnApi, WattsOnNoDeviceError
+from pywatts_on.watts_on import DEVICE_REFRESH_INTERVAL
+
+
+def make_api(devices):
+    api = WattsOnApi("user", "pass", devices=devices)
+    api.lookups = 0
+
+    def fetch_devices():
+        api.lookups += 1
+        api.devices_checked_at = time.time()
+
+    api.fetch_devices = fetch_devices
+    api.ensure_token = lambda: "token"
+    return api
+
+
+def test_stored_devices_skip_lookup():
+    api = make_api({"water": "w1", "heating": "", "checked_at": time.time()})
+    api._ensure_devices()
+    assert api.lookups == 0
+    assert api.discovered_utilities() == ["water"]
+
+
+def test_missing_device_is_rechecked_daily():
+    api = make_api({"water": "w1", "heating": "", "checked_at": time.time() - DEVICE_REFRESH_INTERVAL})
+    api._ensure_devices()
+    api._ensure_devices()
+    assert api.lookups == 1
+
+
+def test_unknown_devices_are_looked_up():
+    api = make_api(None)
+    api._ensure_devices()
+    assert api.lookups == 1
+
+
+def test_require_device_rejects_missing_meter():
+    api = make_api({"water": "w1", "heating": "", "checked_at": time.time()})
+    assert api.require_device("water") == "w1"
+    with pytest.raises(WattsOnNoDeviceError, match="No heating meter"):
+        api.require_device("heating")